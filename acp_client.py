@@ -14,11 +14,15 @@ Example:
 
 import json
 import logging
+import os
 import queue
+import selectors
 import subprocess
 import threading
 from typing import Any, Callable, Dict, List, Optional
 
+from acp_utils import json_loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,54 +54,77 @@ class ACPClient:
         self.reader_thread = threading.Thread(target=self._read_messages, daemon=True)
         self.reader_thread.start()
 
-        # Start stderr reader
-        self.stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
-        self.stderr_thread.start()
-
         logger.info("Started kiro-cli acp subprocess")
 
     def _read_messages(self) -> None:
-        """Read newline-delimited JSON messages from stdout."""
-        while self.running and self.process and self.process.stdout:
-            try:
-                line = self.process.stdout.readline()
-                if not line:
-                    break
-
-                # Log full message for permission requests
-                message = json.loads(line)
-
-                # Debug: Log ALL session/update messages fully
-                if message.get("method") == "session/update":
-                    logger.info(
-                        f"ACPClient: SESSION UPDATE: {json.dumps(message, indent=2)}"
-                    )
-                elif message.get("method") == "session/request_permission":
-                    logger.info(
-                        f"ACPClient: FULL permission request: {json.dumps(message, indent=2)}"
+        """Read stdout (JSON-RPC) and stderr (logs) from a single thread.
+
+        Both pipes are multiplexed with a selector and split into lines
+        here, so each client needs one reader thread instead of two.
+        """
+        selector = selectors.DefaultSelector()
+        selector.register(
+            self.process.stdout.fileno(), selectors.EVENT_READ, self._handle_stdout_line
+        )
+        selector.register(
+            self.process.stderr.fileno(), selectors.EVENT_READ, self._handle_stderr_line
+        )
+        partial: Dict[int, bytes] = {}
+
+        try:
+            while self.running and selector.get_map():
+                for key, _ in selector.select():
+                    data = os.read(key.fd, 65536)
+                    if not data:
+                        selector.unregister(key.fd)
+                        tail = partial.pop(key.fd, b"")
+                        if tail:
+                            key.data(tail.decode("utf-8", errors="replace"))
+                        continue
+
+                    *lines, partial[key.fd] = (partial.get(key.fd, b"") + data).split(
+                        b"\n"
                     )
-                else:
-                    logger.info(
-                        f"ACPClient: Received from kiro-cli: {line.strip()[:200]}"
+                    for line in lines:
+                        key.data(line.decode("utf-8", errors="replace"))
+        except Exception as e:
+            logger.error(f"Error reading from kiro-cli: {e}")
+        finally:
+            selector.close()
+
+    def _handle_stdout_line(self, line: str) -> None:
+        """Parse and route one newline-delimited JSON message."""
+        if not line.strip():
+            return
+
+        try:
+            # Log full message for permission requests
+            message = json_loads(line)
+
+            # Debug: Log ALL session/update messages fully. These arrive once
+            # per streamed chunk, so skip the dump unless debug is enabled.
+            if message.get("method") == "session/update":
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "ACPClient: SESSION UPDATE: %s", json.dumps(message, indent=2)
                     )
+            elif message.get("method") == "session/request_permission":
+                logger.info(
+                    f"ACPClient: FULL permission request: {json.dumps(message, indent=2)}"
+                )
+            else:
+                logger.info(f"ACPClient: Received from kiro-cli: {line.strip()[:200]}")
 
-                self._route_message(message)
+            self._route_message(message)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON: {e}, line: {line}")
-            except Exception as e:
-                logger.error(f"Error reading message: {e}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON: {e}, line: {line}")
+        except Exception as e:
+            logger.error(f"Error reading message: {e}")
 
-    def _read_stderr(self) -> None:
-        """Read stderr output from kiro-cli."""
-        while self.running and self.process and self.process.stderr:
-            try:
-                line = self.process.stderr.readline()
-                if not line:
-                    break
-                logger.info(f"kiro-cli stderr: {line.strip()}")
-            except Exception as e:
-                logger.error(f"Error reading stderr: {e}")
+    def _handle_stderr_line(self, line: str) -> None:
+        """Log one line of kiro-cli stderr output."""
+        logger.info(f"kiro-cli stderr: {line.strip()}")
 
     def _route_message(self, message: Dict[str, Any]) -> None:
         """Route message to pending request or notification handler."""
@@ -107,13 +134,17 @@ class ACPClient:
         method = message.get("method")
 
         logger.debug(
-            f"Routing message: has_id={has_id}, has_method={has_method}, id={msg_id}, method={method}"
+            "Routing message: has_id=%s, has_method=%s, id=%s, method=%s",
+            has_id,
+            has_method,
+            msg_id,
+            method,
         )
 
         if has_id and not has_method:
             # Response to a request (has id but no method)
             if msg_id in self.pending_requests:
-                logger.debug(f"Routing to pending request: {msg_id}")
+                logger.debug("Routing to pending request: %s", msg_id)
                 self.pending_requests[msg_id].put(message)
             else:
                 logger.debug(
@@ -138,7 +169,9 @@ class ACPClient:
             else:
                 # Regular notification
                 logger.debug(
-                    f"ACPClient: Routing notification method={method} to {len(self.notification_handlers)} handlers"
+                    "ACPClient: Routing notification method=%s to %d handlers",
+                    method,
+                    len(self.notification_handlers),
                 )
                 for handler in self.notification_handlers:
                     try:
@@ -20,6 +20,9 @@ from acp_client import ACPClient
 
 logger = logging.getLogger(__name__)
 
+# Permission option kinds in order of preference for auto-approval
+_ALLOW_KIND_RANK = {"allow_once": 0, "allow_always": 1}
+
 
 class ACPSession:
     """High-level interface for an ACP session."""
@@ -47,12 +50,16 @@ class ACPSession:
         request_id = message.get("id")  # Server requests have an id
 
         logger.debug(
-            f"ACPSession: Received notification method={method}, sessionId={params.get('sessionId')}, my_session={self.session_id}, request_id={request_id}"
+            "ACPSession: Received notification method=%s, sessionId=%s, my_session=%s, request_id=%s",
+            method,
+            params.get("sessionId"),
+            self.session_id,
+            request_id,
         )
 
         # Only process notifications for this session
         if params.get("sessionId") != self.session_id:
-            logger.debug(f"ACPSession: Ignoring notification for different session")
+            logger.debug("ACPSession: Ignoring notification for different session")
             return
 
         # Handle permission requests immediately
@@ -62,25 +69,21 @@ class ACPSession:
             # Extract options from the request
             options = params.get("options", [])
 
-            # Find the allow_once option (preferred) or allow_always as fallback
+            # Pick allow_once (preferred), then allow_always, then any other
+            # allow option, in a single pass over the options
             selected_option = None
+            best_rank = len(_ALLOW_KIND_RANK) + 1
             for opt in options:
-                if opt.get("kind") == "allow_once":
+                kind = opt.get("kind", "")
+                rank = _ALLOW_KIND_RANK.get(kind)
+                if rank is None:
+                    if "allow" not in kind:
+                        continue
+                    rank = len(_ALLOW_KIND_RANK)
+                if rank < best_rank:
                     selected_option = opt.get("optionId")
-                    break
-
-            # Fallback to allow_always if allow_once not available
-            if not selected_option:
-                for opt in options:
-                    if opt.get("kind") == "allow_always":
-                        selected_option = opt.get("optionId")
-                        break
-
-            # If still no option found, use the first allow option
-            if not selected_option:
-                for opt in options:
-                    if "allow" in opt.get("kind", ""):
-                        selected_option = opt.get("optionId")
+                    best_rank = rank
+                    if rank == 0:
                         break
 
             if selected_option:
@@ -121,7 +124,7 @@ class ACPSession:
         """Handle session/update notification."""
         # kiro-cli uses 'sessionUpdate' field, not 'type'
         update_type = update.get("sessionUpdate") or update.get("type")
-        logger.debug(f"ACPSession: Received session update type: {update_type}")
+        logger.debug("ACPSession: Received session update type: %s", update_type)
 
         if update_type == "agent_message_chunk":
             # Extract text from content
@@ -131,24 +134,26 @@ class ACPSession:
             else:
                 content = str(content_obj)
 
-            logger.debug(f"ACPSession: Chunk content: {content[:50]}")
+            logger.debug("ACPSession: Chunk content: %.50s", content)
             self.message_chunks.append(content)
             logger.debug(
-                f"ACPSession: Calling {len(self.chunk_callbacks)} chunk callbacks"
+                "ACPSession: Calling %d chunk callbacks", len(self.chunk_callbacks)
             )
             for callback in self.chunk_callbacks:
                 callback(content)
 
         elif update_type in ["tool_call", "ToolCall"]:
             logger.debug(
-                f"ACPSession: Tool call, calling {len(self.tool_call_callbacks)} callbacks"
+                "ACPSession: Tool call, calling %d callbacks",
+                len(self.tool_call_callbacks),
             )
             for callback in self.tool_call_callbacks:
                 callback(update)
 
         elif update_type in ["tool_call_update", "ToolCallUpdate"]:
             logger.debug(
-                f"ACPSession: Tool update, calling {len(self.tool_update_callbacks)} callbacks"
+                "ACPSession: Tool update, calling %d callbacks",
+                len(self.tool_update_callbacks),
             )
             for callback in self.tool_update_callbacks:
                 callback(update)
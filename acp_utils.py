@@ -2,12 +2,28 @@
 ACP detection and utilities.
 """
 
+import json
 import logging
 import subprocess
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when it is installed.
+
+    Raises json.JSONDecodeError on invalid input either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def supports_acp() -> bool:
     """Check if kiro-cli supports ACP."""
     try:
@@ -0,0 +1,38 @@
+"""Console output helpers for the test and monitoring scripts."""
+
+import sys
+import threading
+
+
+class CoalescedPrinter:
+    """Collect output lines and write them to stdout in batches.
+
+    The first append arms a timer; when it fires, everything buffered so
+    far is written with a single write. Call flush() before printing
+    anything directly so ordering is preserved.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._lines = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def append(self, line: str):
+        with self._lock:
+            self._lines.append(line)
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+            lines, self._lines = self._lines, []
+
+        if timer is not None:
+            timer.cancel()
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
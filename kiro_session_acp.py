@@ -6,16 +6,17 @@ with a queue for async-to-sync communication.
 """
 
 import asyncio
-import json
 import logging
-import queue
+import os
 import re
 import threading
+from collections import deque
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
 from acp_client import ACPClient
 from acp_session import ACPSession
+from acp_utils import json_loads
 from context_tracker import ContextTracker
 
 logger = logging.getLogger(__name__)
@@ -28,8 +29,11 @@ class KiroSessionACP:
         self.agents = {}
         self.active_agent = None
 
-        # Queue for messages from async layer to worker thread
-        self.message_queue = queue.Queue()
+        # Queue for messages from async layer to worker thread.
+        # deque.append/popleft are atomic, so producers only need to
+        # set the event to wake the worker - no lock on the data path.
+        self.message_queue = deque()
+        self.message_event = threading.Event()
 
         # Callback for sending messages back to Telegram
         self.send_to_telegram = None
@@ -47,9 +51,17 @@ class KiroSessionACP:
         self.worker_thread = None
         self.running = False
 
+        # Set by the worker once a requested session is up and active
+        self.session_ready = threading.Event()
+
         # Context tracking
         self.context_tracker = ContextTracker()
 
+        # Agent config cache (reloaded when the file changes on disk)
+        self._agent_config = None
+        self._agent_config_mtime = None
+        self._working_dirs = {}
+
     def get_available_models(self):
         """Get list of available models for active agent."""
         if not self.active_agent or self.active_agent not in self.agents:
@@ -64,13 +76,11 @@ class KiroSessionACP:
 
     def set_model(self, model_id: str, chat_id: int):
         """Set the model for the active agent (async-safe)."""
-        self.message_queue.put(
-            {"type": "set_model", "model_id": model_id, "chat_id": chat_id}
-        )
+        self._enqueue({"type": "set_model", "model_id": model_id, "chat_id": chat_id})
 
     def set_mode(self, mode_id: str):
         """Set the mode for the active agent (async-safe)."""
-        self.message_queue.put({"type": "set_mode", "mode_id": mode_id})
+        self._enqueue({"type": "set_mode", "mode_id": mode_id})
 
     def start_worker(self):
         """Start the worker thread."""
@@ -82,38 +92,50 @@ class KiroSessionACP:
         self.worker_thread.start()
         logger.info("Worker thread started")
 
+    def _enqueue(self, msg: Dict[str, Any]):
+        """Hand a message to the worker thread (safe from any thread)."""
+        self.message_queue.append(msg)
+        self.message_event.set()
+
     def _worker_loop(self):
         """Worker thread main loop - processes messages from queue."""
         while self.running:
-            try:
-                # Get message from queue (blocking with timeout)
-                try:
-                    msg = self.message_queue.get(timeout=1)
-                except queue.Empty:
-                    continue
-
-                msg_type = msg.get("type")
-
-                if msg_type == "send_message":
-                    self._handle_send_message(msg)
-                elif msg_type == "start_session":
-                    self._handle_start_session(msg)
-                elif msg_type == "set_model":
-                    self._handle_set_model(msg)
-                elif msg_type == "set_mode":
-                    self._handle_set_mode(msg)
-                elif msg_type == "cancel":
-                    self._handle_cancel(msg)
-                elif msg_type == "close":
+            # Wait for a producer to signal (timeout so we notice running=False)
+            if not self.message_event.wait(timeout=1):
+                continue
+            self.message_event.clear()
+
+            # Drain everything queued since the last wake-up
+            while self.running and self.message_queue:
+                msg = self.message_queue.popleft()
+                if msg.get("type") == "close":
+                    self.running = False
                     break
+                self._dispatch_message(msg)
 
-            except Exception as e:
-                logger.error(f"Error in worker loop: {e}")
-                import traceback
+        logger.info("Worker thread stopped")
 
-                traceback.print_exc()
+    def _dispatch_message(self, msg: Dict[str, Any]):
+        """Route a queued message to its handler."""
+        try:
+            msg_type = msg.get("type")
+
+            if msg_type == "send_message":
+                self._handle_send_message(msg)
+            elif msg_type == "start_session":
+                self._handle_start_session(msg)
+            elif msg_type == "set_model":
+                self._handle_set_model(msg)
+            elif msg_type == "set_mode":
+                self._handle_set_mode(msg)
+            elif msg_type == "cancel":
+                self._handle_cancel(msg)
 
-        logger.info("Worker thread stopped")
+        except Exception as e:
+            logger.error(f"Error in worker loop: {e}")
+            import traceback
+
+            traceback.print_exc()
 
     def _handle_send_message(self, msg: Dict[str, Any]):
         """Handle send_message request in worker thread."""
@@ -143,7 +165,7 @@ class KiroSessionACP:
 
         # Set up callbacks that reference agent_data
         def on_chunk(content):
-            logger.debug(f"Worker: Received chunk: {content[:50]}")
+            logger.debug("Worker: Received chunk: %.50s", content)
             with agent_data["chunk_lock"]:
                 agent_data["chunks"].append(content)
 
@@ -309,8 +331,6 @@ class KiroSessionACP:
                             and hasattr(self, "send_to_telegram")
                             and self.send_to_telegram
                         ):
-                            import asyncio
-
                             if hasattr(self, "event_loop") and self.event_loop:
                                 asyncio.run_coroutine_threadsafe(
                                     self.send_to_telegram(
@@ -329,8 +349,6 @@ class KiroSessionACP:
                             and hasattr(self, "send_to_telegram")
                             and self.send_to_telegram
                         ):
-                            import asyncio
-
                             if hasattr(self, "event_loop") and self.event_loop:
                                 asyncio.run_coroutine_threadsafe(
                                     self.send_to_telegram(
@@ -357,8 +375,6 @@ class KiroSessionACP:
                     and hasattr(self, "send_to_telegram")
                     and self.send_to_telegram
                 ):
-                    import asyncio
-
                     if hasattr(self, "event_loop") and self.event_loop:
                         if status_type == "started":
                             asyncio.run_coroutine_threadsafe(
@@ -402,6 +418,7 @@ class KiroSessionACP:
             }
 
             self.active_agent = agent_name
+            self.session_ready.set()
             logger.info(f"Worker: Session started for {agent_name}")
 
         except Exception as e:
@@ -599,42 +616,68 @@ class KiroSessionACP:
     # Public API (called from async layer)
 
     def _load_agent_config(self):
-        """Load agent configuration from ~/.kiro/bot_agent_config.json"""
-        import os
+        """Load agent configuration from ~/.kiro/bot_agent_config.json
 
+        The parsed config is cached and only re-read when the file's mtime
+        changes.
+        """
         config_path = os.path.expanduser("~/.kiro/bot_agent_config.json")
 
-        if os.path.exists(config_path):
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if self._agent_config is not None and mtime == self._agent_config_mtime:
+            return self._agent_config
+
+        config = None
+        if mtime is not None:
             try:
-                with open(config_path, "r") as f:
-                    return json.load(f)
+                with open(config_path, "rb") as f:
+                    config = json_loads(f.read())
             except Exception as e:
                 logger.error(f"Failed to load agent config: {e}")
 
-        return {"agents": {}, "default_directory": "/home/mark/git/remote-kiro"}
+        if config is None:
+            config = {"agents": {}, "default_directory": "/home/mark/git/remote-kiro"}
 
-    def start_session(self, agent_name: str = "kiro_default", working_dir: str = None):
-        """Start a session (async-safe)."""
-        if not self.running:
-            self.start_worker()
+        self._agent_config = config
+        self._agent_config_mtime = mtime
+        self._working_dirs.clear()
+        return config
+
+    def get_agent_working_directory(self, agent_name: str) -> str:
+        """Resolve the working directory for an agent (memoized per agent)."""
+        config = self._load_agent_config()
 
+        working_dir = self._working_dirs.get(agent_name)
         if working_dir is None:
-            # Load agent config to get working directory
-            config = self._load_agent_config()
             working_dir = (
                 config.get("agents", {}).get(agent_name, {}).get("working_directory")
             )
-
             if not working_dir:
                 working_dir = config.get(
                     "default_directory", "/home/mark/git/remote-kiro"
                 )
+            self._working_dirs[agent_name] = working_dir
+
+        return working_dir
+
+    def start_session(self, agent_name: str = "kiro_default", working_dir: str = None):
+        """Start a session (async-safe)."""
+        if not self.running:
+            self.start_worker()
+
+        if working_dir is None:
+            working_dir = self.get_agent_working_directory(agent_name)
 
         logger.info(
             f"Starting session for agent '{agent_name}' in directory: {working_dir}"
         )
 
-        self.message_queue.put(
+        self.session_ready.clear()
+        self._enqueue(
             {
                 "type": "start_session",
                 "agent_name": agent_name,
@@ -644,18 +687,16 @@ class KiroSessionACP:
 
     def send_message(self, text: str, chat_id: int):
         """Send message to Kiro (async-safe)."""
-        self.message_queue.put(
-            {"type": "send_message", "text": text, "chat_id": chat_id}
-        )
+        self._enqueue({"type": "send_message", "text": text, "chat_id": chat_id})
 
     def cancel_operation(self):
         """Cancel current operation (async-safe)."""
-        self.message_queue.put({"type": "cancel"})
+        self._enqueue({"type": "cancel"})
 
     def close(self):
         """Close all sessions and stop worker."""
         self.running = False
-        self.message_queue.put({"type": "close"})
+        self._enqueue({"type": "close"})
 
         if self.worker_thread:
             self.worker_thread.join(timeout=5)
@@ -691,7 +732,11 @@ class KiroSessionACP:
         return True
 
     def restart_with_agent(self, agent_name: str) -> bool:
-        """Switch to a different agent."""
+        """Switch to a different agent.
+
+        Each agent keeps its own ACP process in self.agents, so only the
+        first switch to an agent starts a session; later switches reuse it.
+        """
         try:
             logger.info(f"Switching to agent: {agent_name}")
 
@@ -699,9 +744,7 @@ class KiroSessionACP:
             if agent_name not in self.agents:
                 self.start_session(agent_name=agent_name)
                 # Give it a moment to start
-                import time
-
-                time.sleep(1)
+                self.session_ready.wait(timeout=1)
 
             # Switch active agent
             self.active_agent = agent_name
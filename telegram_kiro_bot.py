@@ -1,4 +1,5 @@
 #!/usr/bin/env python3.12
+import asyncio
 import configparser
 import json
 import logging
@@ -52,6 +53,7 @@ class TelegramBot:
     ):
         self.token = token
         self.authorized_user = authorized_user
+        self.authorized_users = frozenset({authorized_user})
         self.attachments_dir = Path(
             attachments_dir or "~/.kiro/bot_attachments"
         ).expanduser()
@@ -78,21 +80,33 @@ class TelegramBot:
         # Conversation state for multi-step interactions
         self.user_states = {}  # chat_id -> state dict
 
+        # Cached ~/.kiro/agents listing, refreshed when the directory changes
+        self._custom_agents = []
+        self._custom_agents_mtime = None
+
         # Start fresh session (load_state removed for now - will add back later)
-        print(f"[DEBUG] Starting fresh session")
+        logger.debug("Starting fresh session")
         self.kiro.start_session()
 
+        # Only the authorized user gets through; the dispatcher rejects
+        # everyone else before a handler coroutine is created
+        authorized = filters.User(username=self.authorized_users)
+
         # Add message and command handlers
         self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
+            MessageHandler(
+                filters.TEXT & ~filters.COMMAND & authorized, self.handle_message
+            )
         )
         # Note: Agent and chat commands are handled via interception
         # This allows backslash prefix support (\agent, \chat)
 
         # Attachment handlers
-        self.application.add_handler(MessageHandler(filters.PHOTO, self.handle_photo))
         self.application.add_handler(
-            MessageHandler(filters.Document.ALL, self.handle_document)
+            MessageHandler(filters.PHOTO & authorized, self.handle_photo)
+        )
+        self.application.add_handler(
+            MessageHandler(filters.Document.ALL & authorized, self.handle_document)
         )
 
     def _setup_attachments_dir(self):
@@ -126,10 +140,6 @@ class TelegramBot:
 
     async def handle_photo(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle photo uploads"""
-        username = update.effective_user.username
-        if username != self.authorized_user:
-            return
-
         try:
             # Get highest resolution photo
             photo = update.message.photo[-1]
@@ -163,10 +173,6 @@ class TelegramBot:
 
     async def handle_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle document uploads"""
-        username = update.effective_user.username
-        if username != self.authorized_user:
-            return
-
         try:
             document = update.message.document
             file = await context.bot.get_file(document.file_id)
@@ -201,8 +207,6 @@ class TelegramBot:
         """Handle incoming messages"""
         # Store the event loop for thread-safe calls
         if not self.loop:
-            import asyncio
-
             self.loop = asyncio.get_running_loop()
             # Set the loop on the callback so worker thread can use it
             self.kiro.send_to_telegram.loop = self.loop
@@ -212,11 +216,7 @@ class TelegramBot:
 
         username = update.effective_user.username
         chat_id = update.effective_chat.id
-        print(f"[DEBUG] Received message from user: {username}")
-
-        if username != self.authorized_user:
-            print(f"[DEBUG] Unauthorized user {username}, ignoring")
-            return
+        logger.debug("Received message from user: %s", username)
 
         message_text = update.message.text
 
@@ -225,17 +225,17 @@ class TelegramBot:
             await self.handle_conversation_state(update, context)
             return
 
-        print(f"[DEBUG] About to check intercepted commands for: {message_text}")
+        logger.debug("About to check intercepted commands for: %s", message_text)
         # Check for intercepted commands before processing
         if await self.handle_intercepted_commands(update, context):
-            print(f"[DEBUG] Command was intercepted, returning")
+            logger.debug("Command was intercepted, returning")
             return
 
-        print(f"[DEBUG] Command not intercepted, proceeding to kiro-cli")
+        logger.debug("Command not intercepted, proceeding to kiro-cli")
 
         # Normal message processing
         message_text = message_text.replace("\n", "\\n")
-        print(f"[DEBUG] Processing message: {message_text}")
+        logger.debug("Processing message: %s", message_text)
 
         # Show typing indicator briefly
         await context.bot.send_chat_action(
@@ -243,7 +243,7 @@ class TelegramBot:
         )
 
         # Send to Kiro (non-blocking via queue)
-        print(f"[DEBUG] Sending to Kiro: {message_text}")
+        logger.debug("Sending to Kiro: %s", message_text)
         self.kiro.send_message(message_text, update.effective_chat.id)
 
     async def handle_intercepted_commands(
@@ -251,34 +251,34 @@ class TelegramBot:
     ) -> bool:
         """Handle intercepted kiro commands. Returns True if command was intercepted."""
         message_text = update.message.text.strip()
-        print(f"[DEBUG] Checking interception for: {message_text}")
+        logger.debug("Checking interception for: %s", message_text)
 
         # Normalize backslash to forward slash for consistent processing
         normalized_text = message_text.replace("\\", "/")
-        print(f"[DEBUG] Normalized text: {normalized_text}")
+        logger.debug("Normalized text: %s", normalized_text)
 
         # Help command
         if normalized_text == "/help":
-            print(f"[DEBUG] Intercepted help command")
+            logger.debug("Intercepted help command")
             await self.show_help(update, context)
             return True
 
         # Usage command
         if normalized_text == "/usage":
-            print(f"[DEBUG] Intercepted usage command")
+            logger.debug("Intercepted usage command")
             await self.show_usage(update, context)
             return True
 
         # Cancel command
         if normalized_text == "/cancel":
-            print(f"[DEBUG] Intercepted cancel command")
+            logger.debug("Intercepted cancel command")
             self.kiro.cancel_operation()
             await update.message.reply_text("🛑 Cancelling operation...")
             return True
 
         # Model commands
         if normalized_text.startswith("/model"):
-            print(f"[DEBUG] Intercepted model command")
+            logger.debug("Intercepted model command")
             parts = normalized_text.split(maxsplit=1)
             if len(parts) == 2:
                 if parts[1] == "list":
@@ -297,7 +297,7 @@ class TelegramBot:
 
         # Agent commands
         if normalized_text.startswith("/agent"):
-            print(f"[DEBUG] Intercepted agent command")
+            logger.debug("Intercepted agent command")
             parts = normalized_text.split()
             if len(parts) == 1:
                 # Just "/agent" with no subcommand
@@ -307,7 +307,7 @@ class TelegramBot:
                 return True
             elif len(parts) >= 2:
                 subcommand = parts[1]
-                print(f"[DEBUG] Agent subcommand: {subcommand}")
+                logger.debug("Agent subcommand: %s", subcommand)
 
                 if subcommand == "create":
                     if len(parts) >= 3:
@@ -318,7 +318,7 @@ class TelegramBot:
                     return True
 
                 elif subcommand == "list":
-                    print(f"[DEBUG] Calling list_agents")
+                    logger.debug("Calling list_agents")
                     await self.list_agents(update, context)
                     return True
 
@@ -340,7 +340,7 @@ class TelegramBot:
 
         # Chat commands
         elif normalized_text.startswith("/chat"):
-            print(f"[DEBUG] Intercepted chat command")
+            logger.debug("Intercepted chat command")
             parts = normalized_text.split()
             if len(parts) == 1:
                 # Just "/chat" with no subcommand
@@ -348,7 +348,7 @@ class TelegramBot:
                 return True
             elif len(parts) >= 2:
                 subcommand = parts[1]
-                print(f"[DEBUG] Chat subcommand: {subcommand}")
+                logger.debug("Chat subcommand: %s", subcommand)
 
                 if subcommand == "save" and len(parts) >= 3:
                     chat_name = parts[2]
@@ -366,7 +366,7 @@ class TelegramBot:
 
         # Context commands
         elif normalized_text.startswith("/context"):
-            print(f"[DEBUG] Intercepted context command")
+            logger.debug("Intercepted context command")
             parts = normalized_text.split()
             if len(parts) == 1:
                 # Just "/context" - show usage
@@ -385,7 +385,7 @@ class TelegramBot:
 
         # Compact command
         elif normalized_text == "/compact":
-            print(f"[DEBUG] Intercepted compact command")
+            logger.debug("Intercepted compact command")
             # Send as regular message, not as command
             self.kiro.send_message("/compact", update.effective_chat.id)
             return True
@@ -423,60 +423,64 @@ class TelegramBot:
 
     async def list_agents(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle intercepted /agent list command"""
-        print(f"[DEBUG] list_agents called")
-        print(f"[DEBUG] Update object: {update}")
-        print(f"[DEBUG] Context object: {context}")
-
-        # Authorization check
-        if update.effective_user.username != self.authorized_user:
-            print(
-                f"[DEBUG] Unauthorized user: {update.effective_user.username} != {self.authorized_user}"
-            )
-            return
+        logger.debug("list_agents called")
+        logger.debug("Update object: %s", update)
+        logger.debug("Context object: %s", context)
 
         try:
             # Built-in agents
             builtin_agents = ["kiro_default", "kiro_planner"]
-            print(f"[DEBUG] Built-in agents: {builtin_agents}")
+            logger.debug("Built-in agents: %s", builtin_agents)
 
             # Get custom agents from ~/.kiro/agents/
-            custom_agents = []
-            agents_dir = Path.home() / ".kiro" / "agents"
-            print(f"[DEBUG] Checking agents dir: {agents_dir}")
-            if agents_dir.exists():
-                for agent_file in agents_dir.glob("*.json"):
-                    custom_agents.append(agent_file.stem)
-            print(f"[DEBUG] Custom agents: {custom_agents}")
-            print(f"[DEBUG] Active agent: {self.kiro.active_agent}")
+            custom_agents = self._list_custom_agents()
+            logger.debug("Custom agents: %s", custom_agents)
+            active_agent = self.kiro.active_agent
+            logger.debug("Active agent: %s", active_agent)
 
             # Format response (simplified, no markdown)
-            response = "Available agents:\n\n"
-            response += "Built-in agents:\n"
+            parts = ["Available agents:\n\n", "Built-in agents:\n"]
             for agent in builtin_agents:
-                current_marker = " <- active" if agent == self.kiro.active_agent else ""
-                response += f"• {agent}{current_marker}\n"
+                current_marker = " <- active" if agent == active_agent else ""
+                parts.append(f"• {agent}{current_marker}\n")
 
             if custom_agents:
-                response += "\nCustom agents:\n"
-                for agent in sorted(custom_agents):
-                    current_marker = (
-                        " <- active" if agent == self.kiro.active_agent else ""
-                    )
-                    response += f"• {agent}{current_marker}\n"
-
-            print(f"[DEBUG] Final response length: {len(response)}")
-            print(f"[DEBUG] Final response: '{response}'")
-            print(f"[DEBUG] About to send reply_text")
+                parts.append("\nCustom agents:\n")
+                for agent in custom_agents:
+                    current_marker = " <- active" if agent == active_agent else ""
+                    parts.append(f"• {agent}{current_marker}\n")
+
+            response = "".join(parts)
+
+            logger.debug("Final response length: %d", len(response))
+            logger.debug("Final response: %r", response)
+            logger.debug("About to send reply_text")
             await update.message.reply_text(response)
-            print(f"[DEBUG] Reply sent successfully")
+            logger.debug("Reply sent successfully")
         except Exception as e:
-            print(f"[DEBUG] Error in list_agents: {e}")
-            print(f"[DEBUG] Exception type: {type(e)}")
-            import traceback
-
-            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+            logger.exception(f"Error in list_agents: {e}")
             await update.message.reply_text(f"Error: {e}")
 
+    def _list_custom_agents(self):
+        """List custom agent names, re-reading the directory only when it changes"""
+        agents_dir = Path.home() / ".kiro" / "agents"
+        try:
+            mtime = agents_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+
+        if mtime != self._custom_agents_mtime:
+            # scandir reuses the readdir entry type, so no stat() per file
+            with os.scandir(agents_dir) as entries:
+                self._custom_agents = sorted(
+                    entry.name[:-5]
+                    for entry in entries
+                    if entry.name.endswith(".json")
+                    and entry.is_file(follow_symlinks=False)
+                )
+            self._custom_agents_mtime = mtime
+        return self._custom_agents
+
     async def show_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show all available bot commands"""
         help_text = """📚 Telegram Kiro Bot Commands
@@ -512,9 +516,6 @@ Help
 
     async def show_usage(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle intercepted /usage command - show credits and billing info"""
-        if update.effective_user.username != self.authorized_user:
-            return
-
         try:
             # Send usage request to Kiro CLI
             chat_id = update.effective_chat.id
@@ -524,9 +525,6 @@ Help
 
     async def show_models(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle intercepted /model list command"""
-        if update.effective_user.username != self.authorized_user:
-            return
-
         try:
             models_info = self.kiro.get_available_models()
             modes_info = self.kiro.get_available_modes()
@@ -543,20 +541,22 @@ Help
                 return
 
             # Format the response
-            response = f"<b>Current Model:</b> <code>{current_model}</code>\n"
+            parts = [f"<b>Current Model:</b> <code>{current_model}</code>\n"]
 
             # Add current mode if available
             if modes_info:
                 current_mode = modes_info.get("currentModeId", "unknown")
-                response += f"<b>Current Mode:</b> <code>{current_mode}</code>\n"
+                parts.append(f"<b>Current Mode:</b> <code>{current_mode}</code>\n")
 
-            response += f"\n<b>Available Models:</b>\n"
+            parts.append(f"\n<b>Available Models:</b>\n")
             for model in available_models:
                 model_id = model.get("modelId", "unknown")
                 name = model.get("name", "unknown")
                 description = model.get("description", "")
                 marker = "→ " if model_id == current_model else "  "
-                response += f"{marker}<code>{model_id}</code> - {description}\n"
+                parts.append(f"{marker}<code>{model_id}</code> - {description}\n")
+
+            response = "".join(parts)
 
             await update.message.reply_text(response, parse_mode="HTML")
         except Exception as e:
@@ -567,9 +567,6 @@ Help
         self, update: Update, context: ContextTypes.DEFAULT_TYPE, model_id: str
     ):
         """Handle intercepted /model <model_id> command"""
-        if update.effective_user.username != self.authorized_user:
-            return
-
         try:
             # Validate model exists
             models_info = self.kiro.get_available_models()
@@ -608,13 +605,16 @@ Help
                     "⚠️ Warning: Could not save current state"
                 )
 
+            # Sessions stay alive per agent, so switching back to one that
+            # is already running is just a pointer swap
+            warm = agent_name in self.kiro.agents
+
             # Restart with new agent
             await update.message.reply_text(f"🔄 Switching to agent '{agent_name}'...")
             if self.kiro.restart_with_agent(agent_name):
-                # Wait for session to initialize
-                import asyncio
-
-                await asyncio.sleep(2)
+                if not warm:
+                    # Wait for session to initialize
+                    await asyncio.sleep(2)
                 await update.message.reply_text(f"✅ Switched to agent '{agent_name}'")
             else:
                 await update.message.reply_text(
@@ -645,7 +645,7 @@ Help
     ):
         """Handle intercepted /chat save command"""
         try:
-            print(f"[DEBUG] save_chat called with name: {chat_name}")
+            logger.debug("save_chat called with name: %s", chat_name)
             if self.kiro.save_conversation(chat_name):
                 await update.message.reply_text(
                     f"✅ Conversation saved as '{chat_name}'"
@@ -653,7 +653,7 @@ Help
             else:
                 await update.message.reply_text(f"❌ Failed to save conversation")
         except Exception as e:
-            print(f"[ERROR] Exception in save_chat: {e}")
+            logger.error(f"Exception in save_chat: {e}")
             await update.message.reply_text(f"❌ Error saving conversation: {e}")
 
     async def load_chat(
@@ -895,22 +895,18 @@ Help
 
     def send_response_threadsafe(self, chat_id, text):
         """Send response to Telegram from thread"""
-        print(f"[DEBUG] Thread-safe send for chat {chat_id}: {text[:100]}...")
+        logger.debug("Thread-safe send for chat %s: %.100s...", chat_id, text)
         if self.loop:
-            import asyncio
-
             future = asyncio.run_coroutine_threadsafe(
                 self._send_message_async(chat_id, text), self.loop
             )
             # Don't wait for result to keep it non-blocking
         else:
-            print("[DEBUG] No event loop available yet")
+            logger.debug("No event loop available yet")
 
     def send_typing_indicator_threadsafe(self, chat_id):
         """Send typing indicator to Telegram from thread"""
         if self.loop:
-            import asyncio
-
             future = asyncio.run_coroutine_threadsafe(
                 self._send_typing_async(chat_id), self.loop
             )
@@ -995,25 +991,21 @@ Help
                 chat_id=chat_id, action=ChatAction.TYPING
             )
         except Exception as e:
-            print(f"[DEBUG] Error sending typing indicator: {e}")
+            logger.error(f"Error sending typing indicator: {e}")
 
     async def _send_message_async(self, chat_id, text):
         """Internal async method to send message"""
         try:
-            # Show typing indicator before sending response
-            await self.application.bot.send_chat_action(
-                chat_id=chat_id, action=ChatAction.TYPING
-            )
             await self.application.bot.send_message(
                 chat_id=chat_id, text=text, parse_mode="HTML"
             )
-            print("[DEBUG] Response sent successfully")
+            logger.debug("Response sent successfully")
         except Exception as e:
-            print(f"[DEBUG] Error sending response: {e}")
+            logger.error(f"Error sending response: {e}")
 
     def run(self):
         """Start the bot"""
-        print("Telegram Kiro Bot started...")
+        logger.info("Telegram Kiro Bot started...")
         self.application.run_polling()
 
 
@@ -8,99 +8,207 @@ This script monitors the bot logs to verify that:
 3. Typing indicator stops when response completes
 """
 
+import os
+import re
+import select
 import subprocess
 import sys
 import time
 from datetime import datetime
 
+from console_utils import CoalescedPrinter
+
+try:
+    from systemd import journal
+except ImportError:  # fall back to journalctl
+    journal = None
+
+try:
+    from pystemd.systemd1 import Unit
+except ImportError:  # fall back to systemctl
+    Unit = None
+
+SERVICE_UNIT = "telegram-kiro-bot.service"
+ACTIVE_CACHE_TTL = 5.0
+
+_active_cache = {}
+
+# One alternation over all log events of interest; the matching group's name
+# identifies the event, so each line is scanned once instead of per substring.
+EVENT_PATTERN = re.compile(
+    r"(?P<started>Typing indicator thread started)"
+    r"|(?P<refresh>send_chat_action.*TYPING)"
+    r"|(?P<stopped>Typing indicator thread stopped)"
+    r"|(?P<msg>Worker: Sending message:)"
+    r"|(?P<end>Worker: Turn end complete)"
+    r"|(?P<err>Typing indicator error:)"
+)
+
+EVENT_LABELS = {
+    "started": "✅ TYPING STARTED",
+    "stopped": "⏹️  TYPING STOPPED",
+    "msg": "📨 Message received by bot",
+    "end": "✅ Response complete",
+}
+
+
+def service_is_active(unit=SERVICE_UNIT):
+    """Return whether a systemd unit is active, caching the answer briefly.
+
+    Asks systemd over D-Bus when pystemd is installed, otherwise runs
+    `systemctl is-active`.
+    """
+    now = time.monotonic()
+    cached = _active_cache.get(unit)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    if Unit is not None:
+        systemd_unit = Unit(unit.encode())
+        systemd_unit.load()
+        active = systemd_unit.Unit.ActiveState == b"active"
+    else:
+        result = subprocess.run(
+            ["sudo", "systemctl", "is-active", unit],
+            capture_output=True,
+            text=True,
+        )
+        active = result.stdout.strip() == "active"
+
+    _active_cache[unit] = (now + ACTIVE_CACHE_TTL, active)
+    return active
+
+
+def follow_journal(duration):
+    """Yield new log messages from the bot service for up to duration seconds.
+
+    Reads journald directly when python-systemd is installed, otherwise
+    follows `journalctl` output.
+    """
+    deadline = time.monotonic_ns() + duration * 1_000_000_000
+
+    if journal is not None:
+        reader = journal.Reader()
+        try:
+            reader.this_boot()
+            reader.add_match(_SYSTEMD_UNIT=SERVICE_UNIT)
+            reader.seek_realtime(datetime.now())
+            poller = select.poll()
+            poller.register(reader.fileno(), reader.get_events())
+
+            while (remaining_ns := deadline - time.monotonic_ns()) > 0:
+                if not poller.poll(remaining_ns // 1_000_000):
+                    continue
+                if reader.process() != journal.APPEND:
+                    continue
+                for entry in reader:
+                    yield entry.get("MESSAGE", "")
+        finally:
+            reader.close()
+        return
 
-def monitor_logs(duration=30):
-    """Monitor bot logs for typing indicator activity."""
-    print(f"Monitoring logs for {duration} seconds...")
-    print("=" * 60)
-    print("Send a message to the bot now that takes >10 seconds to process")
-    print("Example: 'Count from 1 to 20 slowly with 1 second between each'")
-    print("=" * 60)
-    print()
-
-    # Start log monitoring
     cmd = [
         "sudo",
         "journalctl",
         "-u",
-        "telegram-kiro-bot.service",
+        SERVICE_UNIT,
         "-f",
         "--since",
         "now",
+        # Message text only, matching what the journald reader yields
+        "-o",
+        "cat",
     ]
 
+    # Unbuffered binary pipe: os.read returns whatever is available (up to
+    # 64 KiB) without waiting to fill a buffer, and each chunk is decoded once.
+    # stderr is never read, so don't give it a pipe that could fill up.
     process = subprocess.Popen(
-        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
     )
 
-    typing_started = False
-    typing_stopped = False
-    typing_count = 0
-    start_time = time.time()
-
+    pending = b""
     try:
-        while time.time() - start_time < duration:
-            line = process.stdout.readline()
-            if not line:
+        while time.monotonic_ns() < deadline:
+            chunk = os.read(process.stdout.fileno(), 65536)
+            if not chunk:
                 break
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8", errors="replace")
+    finally:
+        process.terminate()
+        process.wait()
 
-            timestamp = datetime.now().strftime("%H:%M:%S")
-
-            # Check for typing indicator events
-            if "Typing indicator thread started" in line:
-                typing_started = True
-                print(f"[{timestamp}] ✅ TYPING STARTED")
 
-            elif "send_chat_action" in line and "TYPING" in line:
-                typing_count += 1
-                print(f"[{timestamp}] 🔄 Typing indicator refresh #{typing_count}")
+def monitor_logs(duration=30):
+    """Monitor bot logs for typing indicator activity."""
+    print(f"Monitoring logs for {duration} seconds...")
+    print("=" * 60)
+    print("Send a message to the bot now that takes >10 seconds to process")
+    print("Example: 'Count from 1 to 20 slowly with 1 second between each'")
+    print("=" * 60)
+    print()
 
-            elif "Typing indicator thread stopped" in line:
-                typing_stopped = True
-                print(f"[{timestamp}] ⏹️  TYPING STOPPED")
+    counts = dict.fromkeys(EVENT_PATTERN.groupindex, 0)
+    printer = CoalescedPrinter(interval=0.25)
 
-            elif "Worker: Sending message:" in line:
-                print(f"[{timestamp}] 📨 Message received by bot")
+    try:
+        for line in follow_journal(duration):
+            match = EVENT_PATTERN.search(line)
+            if not match:
+                continue
 
-            elif "Worker: Turn end complete" in line:
-                print(f"[{timestamp}] ✅ Response complete")
+            event = match.lastgroup
+            counts[event] += 1
+            timestamp = datetime.now().strftime("%H:%M:%S")
 
-            elif "Typing indicator error:" in line:
-                print(f"[{timestamp}] ❌ ERROR: {line.strip()}")
+            if event == "refresh":
+                printer.append(
+                    f"[{timestamp}] 🔄 Typing indicator refresh #{counts[event]}"
+                )
+            elif event == "err":
+                printer.append(f"[{timestamp}] ❌ ERROR: {line.strip()}")
+            else:
+                printer.append(f"[{timestamp}] {EVENT_LABELS[event]}")
 
     except KeyboardInterrupt:
+        printer.flush()
         print("\n\nMonitoring stopped by user")
 
-    finally:
-        process.terminate()
-        process.wait()
+    printer.flush()
+
+    typing_started = counts["started"] > 0
+    typing_stopped = counts["stopped"] > 0
+    typing_count = counts["refresh"]
 
     # Summary
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-    print(f"Typing started: {'✅ YES' if typing_started else '❌ NO'}")
-    print(f"Typing refreshes: {typing_count}")
-    print(f"Typing stopped: {'✅ YES' if typing_stopped else '❌ NO'}")
-    print()
+    passed = typing_started and typing_count > 0 and typing_stopped
+    summary = [
+        "",
+        "=" * 60,
+        "SUMMARY",
+        "=" * 60,
+        f"Typing started: {'✅ YES' if typing_started else '❌ NO'}",
+        f"Typing refreshes: {typing_count}",
+        f"Typing stopped: {'✅ YES' if typing_stopped else '❌ NO'}",
+        "",
+    ]
 
-    if typing_started and typing_count > 0 and typing_stopped:
-        print("✅ TEST PASSED: Typing indicator working correctly!")
-        return 0
+    if passed:
+        summary.append("✅ TEST PASSED: Typing indicator working correctly!")
     else:
-        print("❌ TEST FAILED: Issues detected")
+        summary.append("❌ TEST FAILED: Issues detected")
         if not typing_started:
-            print("  - Typing indicator never started")
+            summary.append("  - Typing indicator never started")
         if typing_count == 0:
-            print("  - No typing indicator refreshes detected")
+            summary.append("  - No typing indicator refreshes detected")
         if not typing_stopped:
-            print("  - Typing indicator never stopped")
-        return 1
+            summary.append("  - Typing indicator never stopped")
+
+    sys.stdout.write("\n".join(summary) + "\n")
+    sys.stdout.flush()
+    return 0 if passed else 1
 
 
 if __name__ == "__main__":
@@ -109,13 +217,7 @@ if __name__ == "__main__":
     print()
 
     # Check if bot is running
-    result = subprocess.run(
-        ["sudo", "systemctl", "is-active", "telegram-kiro-bot"],
-        capture_output=True,
-        text=True,
-    )
-
-    if result.stdout.strip() != "active":
+    if not service_is_active():
         print("❌ Bot service is not running!")
         print("Start it with: sudo systemctl start telegram-kiro-bot")
         sys.exit(1)
@@ -0,0 +1,152 @@
+"""Small helpers shared by the test scripts."""
+
+import asyncio
+import atexit
+import concurrent.futures
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from acp_client import ACPClient
+from acp_session import ACPSession
+
+PROJECT_DIR = "/home/mark/git/remote-kiro"
+
+# Per-chunk diagnostics are off unless KIRO_TEST_VERBOSE is set
+VERBOSE = bool(os.environ.get("KIRO_TEST_VERBOSE"))
+
+# Started and initialized clients, one per working directory
+_clients: Dict[str, ACPClient] = {}
+
+
+class Recorder:
+    """Collect streamed chunks and tool calls from an ACPSession.
+
+    Register the bound methods as session callbacks. Chunks are written
+    to one StringIO buffer; they and tool calls are only echoed to stdout
+    when verbose.
+    """
+
+    __slots__ = ("buffer", "chunk_count", "tools", "verbose", "indent")
+
+    def __init__(self, verbose: bool = VERBOSE, indent: str = ""):
+        self.buffer = io.StringIO()
+        self.chunk_count = 0
+        self.tools = []
+        self.verbose = verbose
+        self.indent = indent
+
+    @property
+    def text(self) -> str:
+        return self.buffer.getvalue()
+
+    def on_chunk(self, content):
+        self.buffer.write(content)
+        self.chunk_count += 1
+        if self.verbose:
+            print(f"{self.indent}📝 CHUNK: {content[:50]!r}")
+
+    def on_tool_call(self, tool):
+        self.tools.append(tool)
+        if self.verbose:
+            print(f"{self.indent}🔧 TOOL CALL: {tool.get('title', 'unknown')}")
+
+
+def cancel_and_wait(session, future, timeout: float = 5) -> bool:
+    """Cancel session's running turn and give its send future time to finish.
+
+    Used after a timed-out send so the prompt does not keep the shared
+    kiro-cli process and an executor thread busy. Returns False if the
+    future is still running after the cancel.
+    """
+    try:
+        session.cancel()
+        future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        return False
+    except Exception:
+        pass
+    return True
+
+
+def get_client(cwd: str = PROJECT_DIR) -> ACPClient:
+    """Return the initialized ACP client for cwd, starting it on first use."""
+    client = _clients.get(cwd)
+    if client is None:
+        client = ACPClient(cwd)
+        client.start()
+        client.initialize()
+        _clients[cwd] = client
+    return client
+
+
+@atexit.register
+def _close_clients():
+    while _clients:
+        _, client = _clients.popitem()
+        client.close()
+
+
+@contextmanager
+def client_session(client: ACPClient, cwd: str = PROJECT_DIR):
+    """Open a session on a shared client and detach it again on exit.
+
+    On exit any active turn is cancelled and the session's notification
+    handler is unregistered, so nothing carries over to later tests.
+    """
+    session = ACPSession(client.create_session(cwd), client)
+    # Tests may wrap _handle_notification, so keep the registered handler
+    handler = session._handle_notification
+    try:
+        yield session
+    finally:
+        try:
+            session.cancel()
+        except Exception:
+            pass
+        client.notification_handlers.remove(handler)
+
+
+@contextmanager
+def standalone_session(cwd: str = PROJECT_DIR):
+    """Start a client and session for running a test module as a script."""
+    client = ACPClient(cwd)
+    client.start()
+    try:
+        client.initialize()
+        yield ACPSession(client.create_session(cwd), client)
+    finally:
+        client.close()
+
+
+def start_loop_thread():
+    """Run a new event loop forever on a daemon thread; returns (loop, thread)."""
+    loop = asyncio.new_event_loop()
+
+    def run_loop():
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    thread = threading.Thread(target=run_loop, daemon=True)
+    thread.start()
+    return loop, thread
+
+
+def stop_loop_thread(loop, thread, timeout: float = 1):
+    """Drain callbacks already queued on loop, then stop and join its thread."""
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=timeout)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=timeout)
+
+
+def wait_for(predicate, timeout: float = 5, interval: float = 0.05) -> bool:
+    """Poll predicate until it returns truthy or timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
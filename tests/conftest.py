@@ -0,0 +1,76 @@
+"""Shared pytest fixtures for the ACP tests."""
+
+import concurrent.futures
+import shutil
+
+import pytest
+
+from kiro_session_acp import KiroSessionACP
+from tests._helpers import (
+    PROJECT_DIR,
+    client_session,
+    get_client,
+    start_loop_thread,
+    stop_loop_thread,
+)
+
+KIRO_CLI = shutil.which("kiro-cli")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the kiro-cli probe tests up front when the binary is missing."""
+    if KIRO_CLI is not None:
+        return
+
+    skip = pytest.mark.skip(reason="kiro-cli not installed")
+    for item in items:
+        if "test_kiro_cli" in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def kiro_cli_path():
+    """Absolute path to kiro-cli; skips the requesting tests if it is missing."""
+    if KIRO_CLI is None:
+        pytest.skip("kiro-cli not found in PATH")
+    return KIRO_CLI
+
+
+@pytest.fixture(scope="session")
+def bg_executor():
+    """Worker threads for running blocking calls under a timeout."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.fixture(scope="session")
+def bg_loop():
+    """An event loop running on its own thread, for async Telegram mocks."""
+    loop, thread = start_loop_thread()
+    yield loop
+    stop_loop_thread(loop, thread)
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def acp_client():
+    """One started and initialized kiro-cli acp process for the whole run."""
+    return get_client(PROJECT_DIR)
+
+
+@pytest.fixture
+def acp_session(acp_client):
+    """A fresh session per test on the shared ACP client."""
+    with client_session(acp_client) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def kiro():
+    """A KiroSessionACP with kiro_default running, shared by the mode tests."""
+    session = KiroSessionACP()
+    session.start_session("kiro_default")
+    session.session_ready.wait(timeout=5)
+    yield session
+    session.close()
@@ -4,8 +4,8 @@
 import pytest
 
 from acp_client import ACPClient
-from acp_session import ACPSession
 from kiro_session_acp import KiroSessionACP
+from tests._helpers import Recorder
 
 
 class TestACPBasic:
@@ -21,43 +21,29 @@ class TestACPBasic:
         assert "agentInfo" in result
         assert result["agentInfo"]["name"] == "Kiro Agent"
 
-    def test_session_creation(self):
+    def test_session_creation(self, acp_client):
         """Test session creation."""
-        client = ACPClient("/home/mark/git/remote-kiro")
-        client.start()
-        client.initialize()
-        session_id = client.create_session("/home/mark/git/remote-kiro")
-        client.close()
+        session_id = acp_client.create_session("/home/mark/git/remote-kiro")
 
         assert session_id
         assert len(session_id) > 0
 
-    def test_message_flow(self):
+    def test_message_flow(self, acp_session):
         """Test complete message flow."""
-        client = ACPClient("/home/mark/git/remote-kiro")
-        client.start()
-        client.initialize()
-        session_id = client.create_session("/home/mark/git/remote-kiro")
-        session = ACPSession(session_id, client)
-
-        chunks = []
+        recorder = Recorder()
         turn_ended = False
 
-        def on_chunk(content):
-            chunks.append(content)
-
         def on_turn_end():
             nonlocal turn_ended
             turn_ended = True
 
-        session.on_chunk(on_chunk)
-        session.on_turn_end(on_turn_end)
-        session.send_message("what is 2+2?")
-        client.close()
+        acp_session.on_chunk(recorder.on_chunk)
+        acp_session.on_turn_end(on_turn_end)
+        acp_session.send_message("what is 2+2?")
 
         assert turn_ended
-        assert len(chunks) > 0
-        assert "4" in "".join(chunks)
+        assert recorder.chunk_count > 0
+        assert "4" in recorder.text
 
 
 class TestKiroSessionACP:
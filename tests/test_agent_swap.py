@@ -5,12 +5,16 @@ Test agent switching via restart_with_agent (simulates bot behavior).
 
 import logging
 import sys
-import time
+
+import pytest
 
 logging.basicConfig(level=logging.WARNING)  # Reduce noise
 
 from kiro_session_acp import KiroSessionACP
 
+# Switches agents, so keep it off other workers' kiro-cli processes
+pytestmark = pytest.mark.xdist_group("serial")
+
 
 def test_agent_swap():
     """Test agent swap like the bot does."""
@@ -24,7 +28,7 @@ def test_agent_swap():
     # Start with default agent
     print("\n1. Starting with kiro_default")
     kiro.start_session("kiro_default")
-    time.sleep(1.5)
+    kiro.session_ready.wait(timeout=5)
 
     print(f"   Active agent: {kiro.active_agent}")
 
@@ -32,7 +36,7 @@ def test_agent_swap():
     print("\n2. Swapping to AndroidRTSP")
     result = kiro.restart_with_agent("AndroidRTSP")
     print(f"   Swap result: {result}")
-    time.sleep(1.5)
+    kiro.session_ready.wait(timeout=5)
 
     print(f"   Active agent: {kiro.active_agent}")
 
@@ -3,27 +3,30 @@
 Test agent switching with working directory configuration.
 """
 
-import json
 import logging
 import os
 import sys
 import time
+from functools import lru_cache
 
-logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
+import pytest
 
-from acp_client import ACPClient
-from acp_session import ACPSession
+from acp_utils import json_loads
+from tests._helpers import Recorder, client_session, get_client
 
 
+@lru_cache(maxsize=1)
 def load_agent_config():
-    """Load agent configuration."""
+    """Load agent configuration (read once per run)."""
     config_path = os.path.expanduser("~/.kiro/bot_agent_config.json")
     if os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            return json.load(f)
+        with open(config_path, "rb") as f:
+            return json_loads(f.read())
     return {"agents": {}, "default_directory": "/home/mark/git/remote-kiro"}
 
 
+# Covers starting kiro-cli in the agent directory as well as the prompt
+@pytest.mark.timeout(45, method="signal")
 def test_agent_working_directory():
     """Test that agents start in their configured working directory."""
     print("=" * 80)
@@ -43,67 +46,33 @@ def test_agent_working_directory():
     print(f"\n1. Testing agent: {agent_name}")
     print(f"   Expected working directory: {expected_dir}")
 
-    # Start client with the configured directory
-    client = ACPClient(expected_dir)
-    client.start()
-    client.initialize()
+    # Start kiro-cli in the configured directory, as the bot does per agent
+    client = get_client(expected_dir)
+    with client_session(client, expected_dir) as session:
+        print(f"   Session ID: {session.session_id}")
 
-    # Create session
-    session_id = client.create_session(expected_dir)
-    print(f"   Session ID: {session_id}")
+        # Track response
+        recorder = Recorder(indent="   ")
 
-    session = ACPSession(session_id, client)
+        def on_turn_end():
+            print(f"   📨 Response: {recorder.text}")
 
-    # Track response
-    chunks_received = []
+        session.on_chunk(recorder.on_chunk)
+        session.on_tool_call(recorder.on_tool_call)
+        session.on_turn_end(on_turn_end)
 
-    def on_chunk(content):
-        chunks_received.append(content)
+        # Ask for pwd
+        print("\n2. Asking 'what is the pwd'")
 
-    def on_tool_call(tool):
-        print(f"   🔧 Tool: {tool.get('title')}")
-
-    def on_turn_end():
-        full_message = "".join(chunks_received)
-        print(f"   📨 Response: {full_message}")
-
-    session.on_chunk(on_chunk)
-    session.on_tool_call(on_tool_call)
-    session.on_turn_end(on_turn_end)
-
-    # Ask for pwd
-    print("\n2. Asking 'what is the pwd'")
-
-    import threading
-
-    result_container = {"completed": False}
-
-    def send_with_timeout():
-        try:
-            session.send_message("what is the pwd")
-            result_container["completed"] = True
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-
-    thread = threading.Thread(target=send_with_timeout, daemon=True)
-    thread.start()
-    thread.join(timeout=15)
-
-    if not result_container["completed"]:
-        print("   ⏱️  Timeout")
-        client.close()
-        assert False, "Request timed out"
+        session.send_message("what is the pwd")
 
     # Check the response
-    full_response = "".join(chunks_received)
+    full_response = recorder.text
 
     print("\n3. Verification:")
     print(f"   Expected directory in response: {expected_dir}")
     print(f"   Actual response: {full_response}")
 
-    # Cleanup
-    client.close()
-
     # Assert
     assert (
         expected_dir in full_response
@@ -112,4 +81,8 @@ def test_agent_working_directory():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s"
+    )
+    # Clients started by get_client() are closed at exit
     test_agent_working_directory()
@@ -5,11 +5,11 @@ Complete end-to-end test simulating actual bot behavior.
 
 import asyncio
 import logging
+import sys
 import time
+import traceback
 from unittest.mock import Mock
 
-logging.basicConfig(level=logging.INFO, format="%(message)s")
-
 import pytest
 
 from kiro_session_acp import KiroSessionACP
@@ -24,6 +24,20 @@ async def test_complete_flow():
 
     # Track messages
     messages_sent = []
+    message_event = asyncio.Event()
+
+    async def wait_for_messages(predicate, timeout):
+        """Wait until predicate() holds or the timeout expires."""
+
+        async def _wait():
+            while not predicate():
+                message_event.clear()
+                await message_event.wait()
+
+        try:
+            await asyncio.wait_for(_wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
     # Create mock bot with proper async methods
     mock_bot = Mock()
@@ -32,6 +46,7 @@ async def test_complete_flow():
 
     async def mock_send_message(chat_id, text):
         messages_sent.append(text)
+        message_event.set()
         print(f"\n📱 TELEGRAM: {text[:100]}")
 
     async def mock_send_chat_action(chat_id, action):
@@ -57,7 +72,7 @@ async def test_complete_flow():
     kiro.send_to_kiro("what is 2+2?")
 
     # Wait for response
-    await asyncio.sleep(5)
+    await wait_for_messages(lambda: messages_sent, 5)
 
     if messages_sent:
         print(f"   ✅ Got response: {messages_sent[-1]}")
@@ -71,8 +86,14 @@ async def test_complete_flow():
     messages_before = len(messages_sent)
     kiro.send_to_kiro("list files")
 
+    def tool_and_response_seen():
+        new_messages = messages_sent[messages_before:]
+        return any("🔧" in msg for msg in new_messages) and any(
+            len(msg) > 50 for msg in new_messages
+        )
+
     # Wait for tool and response
-    await asyncio.sleep(10)
+    await wait_for_messages(tool_and_response_seen, 10)
 
     new_messages = messages_sent[messages_before:]
     has_tool = any("🔧" in msg for msg in new_messages)
@@ -93,13 +114,18 @@ async def test_complete_flow():
     kiro.close()
 
     # Summary
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-    print(f"Total messages sent to Telegram: {len(messages_sent)}")
+    summary = [
+        "",
+        "=" * 60,
+        "SUMMARY",
+        "=" * 60,
+        f"Total messages sent to Telegram: {len(messages_sent)}",
+    ]
     for i, msg in enumerate(messages_sent, 1):
         preview = msg[:80] + "..." if len(msg) > 80 else msg
-        print(f"  {i}. {preview}")
+        summary.append(f"  {i}. {preview}")
+    sys.stdout.write("\n".join(summary) + "\n")
+    sys.stdout.flush()
 
     success = len(messages_sent) >= 2 and has_tool and has_response
     return success
@@ -118,14 +144,10 @@ async def main():
             return 1
     except Exception as e:
         print(f"\n❌ TEST CRASHED: {e}")
-        import traceback
-
         traceback.print_exc()
         return 1
 
 
 if __name__ == "__main__":
-    loop = asyncio.get_event_loop()
-    exit_code = loop.run_until_complete(main())
-    loop.close()
-    exit(exit_code)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(main()))
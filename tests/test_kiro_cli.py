@@ -4,6 +4,8 @@ import time
 
 import pytest
 
+pytestmark = pytest.mark.usefixtures("kiro_cli_path")
+
 
 class TestKiroCLI:
     """Test suite for Kiro CLI interface validation."""
@@ -19,13 +21,22 @@ class TestKiroCLI:
         except subprocess.TimeoutExpired:
             pytest.fail(f"Command timed out: {' '.join(cmd)}")
         except FileNotFoundError:
-            pytest.fail("kiro-cli not found in PATH")
+            pytest.skip("kiro-cli not found in PATH")
+
+    @pytest.fixture(scope="class")
+    def kiro_help(self):
+        """`kiro-cli --help`, run once for the class."""
+        return self.run_kiro_command(["--help"])
+
+    @pytest.fixture(scope="class")
+    def agent_list(self):
+        """`kiro-cli agent list`, run once for the class."""
+        return self.run_kiro_command(["agent", "list"])
 
-    def test_kiro_help(self):
+    def test_kiro_help(self, kiro_help):
         """Test basic help command."""
-        result = self.run_kiro_command(["--help"])
-        assert result.returncode == 0
-        assert "kiro-cli" in result.stdout.lower()
+        assert kiro_help.returncode == 0
+        assert "kiro-cli" in kiro_help.stdout.lower()
 
     def test_kiro_usage(self):
         """Test usage information."""
@@ -33,16 +44,14 @@ class TestKiroCLI:
         # Should show usage or help when no args provided
         assert result.returncode in [0, 1]  # Some CLIs return 1 for usage
 
-    def test_agent_list(self):
+    def test_agent_list(self, agent_list):
         """Test agent list command."""
-        result = self.run_kiro_command(["agent", "list"])
-        assert result.returncode == 0
+        assert agent_list.returncode == 0
 
-    def test_agent_swap(self):
+    def test_agent_swap(self, agent_list):
         """Test agent swap command (should show available agents)."""
-        # First get list of agents
-        list_result = self.run_kiro_command(["agent", "list"])
-        if list_result.returncode == 0 and list_result.stdout.strip():
+        # Only meaningful when some agents are listed
+        if agent_list.returncode == 0 and agent_list.stdout.strip():
             # Try to swap to first available agent or test swap help
             swap_result = self.run_kiro_command(["agent", "swap", "--help"])
             assert swap_result.returncode in [0, 1]
@@ -67,6 +76,7 @@ class TestKiroCLI:
 class TestKiroInterface:
     """Test Kiro CLI interface through subprocess interaction."""
 
+    @pytest.mark.xdist_group("kiro_cli_interactive")
     def test_kiro_basic_interaction(self):
         """Test basic interaction with kiro-cli chat."""
         try:
@@ -74,14 +84,12 @@ class TestKiroInterface:
             proc = subprocess.Popen(
                 ["kiro-cli", "chat", "--trust-all-tools"],
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
 
             # Send a simple test message
-            test_input = "hello\n/quit\n"
-            stdout, stderr = proc.communicate(input=test_input, timeout=30)
+            proc.communicate(input=b"hello\n/quit\n", timeout=30)
 
             # Should exit cleanly
             assert proc.returncode in [0, 1]  # Some exit codes are acceptable
@@ -92,20 +100,19 @@ class TestKiroInterface:
         except FileNotFoundError:
             pytest.skip("kiro-cli not available for interactive testing")
 
+    @pytest.mark.xdist_group("kiro_cli_interactive")
     def test_kiro_tools_trust(self):
         """Test tools trust functionality."""
         try:
             proc = subprocess.Popen(
                 ["kiro-cli", "chat"],
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
 
             # Test tools trust command
-            test_input = "/tools trust-all\n/quit\n"
-            stdout, stderr = proc.communicate(input=test_input, timeout=20)
+            proc.communicate(input=b"/tools trust-all\n/quit\n", timeout=20)
 
             assert proc.returncode in [0, 1]
 
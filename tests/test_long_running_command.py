@@ -3,17 +3,31 @@
 Test long-running command to verify Kiro sends output after completion.
 """
 
+import concurrent.futures
+import io
 import logging
 import sys
 import time
 
-logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
+import pytest
 
 from acp_client import ACPClient
 from acp_session import ACPSession
+from console_utils import CoalescedPrinter
+from tests._helpers import cancel_and_wait
 
 
-def test_long_running_command():
+def _stdout(update):
+    """Return the stripped stdout of a completed tool update, or ''."""
+    items = (update.get("rawOutput") or {}).get("items")
+    if not items:
+        return ""
+    return items[0].get("Json", {}).get("stdout", "").strip()
+
+
+# Client startup + 5s command + buffer; signal method fails just this test
+@pytest.mark.timeout(45, method="signal")
+def test_long_running_command(bg_executor):
     print("=" * 80)
     print("TEST: Long-running command (for loop with sleep)")
     print("=" * 80)
@@ -21,126 +35,132 @@ def test_long_running_command():
     # Start client
     client = ACPClient("/home/mark/git/remote-kiro")
     client.start()
-
-    # Initialize
-    print("\n1. INITIALIZING...")
-    result = client.initialize()
-    print(f"   Initialized: {result['agentInfo']['name']}")
-
-    # Create session
-    print("\n2. CREATING SESSION...")
-    session_id = client.create_session("/home/mark/git/remote-kiro")
-    print(f"   Session ID: {session_id}")
-
-    # Create session wrapper
-    session = ACPSession(session_id, client)
-
-    # Track what we receive
-    chunks_received = []
-    tools_called = []
-    tool_updates_received = []
-    tool_start_time = None
-    tool_end_time = None
-
-    def on_chunk(content):
-        nonlocal tool_end_time
-        if tool_start_time and not tool_end_time:
-            tool_end_time = time.time()
-            elapsed = tool_end_time - tool_start_time
-            print(f"   📝 FIRST CHUNK after {elapsed:.1f}s: {repr(content[:50])}")
-        chunks_received.append(content)
-
-    def on_tool_call(tool):
-        nonlocal tool_start_time
-        tool_name = tool.get("title", "unknown")
-        tool_start_time = time.time()
-        print(f"   🔧 TOOL CALL: {tool_name}")
-        tools_called.append(tool)
-
-    def on_tool_update(update):
-        print(f"   🔄 TOOL UPDATE: status={update.get('status')}")
-        tool_updates_received.append(update)
-
-        # Check for stdout
-        if update.get("status") == "completed":
-            raw_output = update.get("rawOutput", {})
-            items = raw_output.get("items", [])
-            if items:
-                output_data = items[0].get("Json", {})
-                stdout = output_data.get("stdout", "").strip()
+    try:
+        # Initialize
+        print("\n1. INITIALIZING...")
+        result = client.initialize()
+        print(f"   Initialized: {result['agentInfo']['name']}")
+
+        # Create session
+        print("\n2. CREATING SESSION...")
+        session_id = client.create_session("/home/mark/git/remote-kiro")
+        print(f"   Session ID: {session_id}")
+
+        # Create session wrapper
+        session = ACPSession(session_id, client)
+
+        # Track what we receive
+        message_buffer = io.StringIO()
+        chunk_count = 0
+        tools_called = []
+        tool_updates_received = []
+        tool_start_ns = None
+        tool_end_ns = None
+        printer = CoalescedPrinter(interval=0.25)
+
+        def on_chunk(content):
+            nonlocal tool_end_ns, chunk_count
+            if tool_start_ns is not None and tool_end_ns is None:
+                tool_end_ns = time.monotonic_ns()
+                elapsed_ns = tool_end_ns - tool_start_ns
+                printer.append(
+                    f"   📝 FIRST CHUNK after {elapsed_ns / 1e9:.1f}s: {repr(content[:50])}"
+                )
+            message_buffer.write(content)
+            chunk_count += 1
+
+        def on_tool_call(tool):
+            nonlocal tool_start_ns
+            tool_name = tool.get("title", "unknown")
+            tool_start_ns = time.monotonic_ns()
+            printer.append(f"   🔧 TOOL CALL: {tool_name}")
+            tools_called.append(tool)
+
+        def on_tool_update(update):
+            printer.append(f"   🔄 TOOL UPDATE: status={update.get('status')}")
+            tool_updates_received.append(update)
+
+            # Check for stdout
+            if update.get("status") == "completed":
+                stdout = _stdout(update)
                 if stdout:
-                    print(f"   📤 STDOUT RECEIVED ({len(stdout)} bytes):")
-                    print(f"      {stdout[:100]}")
-
-    def on_turn_end():
-        elapsed = time.time() - tool_start_time if tool_start_time else 0
-        print(
-            f"   ✅ TURN END after {elapsed:.1f}s - {len(chunks_received)} chunks received"
+                    printer.append(f"   📤 STDOUT RECEIVED ({len(stdout)} bytes):")
+                    printer.append(f"      {stdout[:100]}")
+
+        def on_turn_end():
+            elapsed_ns = (
+                time.monotonic_ns() - tool_start_ns if tool_start_ns is not None else 0
+            )
+            printer.append(
+                f"   ✅ TURN END after {elapsed_ns / 1e9:.1f}s - {chunk_count} chunks received"
+            )
+            full_message = message_buffer.getvalue()
+            printer.append(f"   📨 FULL MESSAGE ({len(full_message)} chars):")
+            printer.append(f"      {full_message[:200]}")
+
+        # Register callbacks
+        session.on_chunk(on_chunk)
+        session.on_tool_call(on_tool_call)
+        session.on_tool_update(on_tool_update)
+        session.on_turn_end(on_turn_end)
+
+        # Send prompt - ask for 5 iterations (5 seconds total)
+        print("\n3. SENDING PROMPT: 'for i in {1..5}; do echo hello $i; sleep 1; done'")
+        print("   Expected: Tool executes for ~5 seconds, then Kiro sends response")
+
+        future = bg_executor.submit(
+            session.send_message, "for i in {1..5}; do echo hello $i; sleep 1; done"
         )
-        full_message = "".join(chunks_received)
-        print(f"   📨 FULL MESSAGE ({len(full_message)} chars):")
-        print(f"      {full_message[:200]}")
-
-    # Register callbacks
-    session.on_chunk(on_chunk)
-    session.on_tool_call(on_tool_call)
-    session.on_tool_update(on_tool_update)
-    session.on_turn_end(on_turn_end)
-
-    # Send prompt - ask for 5 iterations (5 seconds total)
-    print("\n3. SENDING PROMPT: 'for i in {1..5}; do echo hello $i; sleep 1; done'")
-    print("   Expected: Tool executes for ~5 seconds, then Kiro sends response")
-
-    import threading
-
-    result_container = {"completed": False, "error": None}
-
-    def send_with_timeout():
         try:
-            session.send_message("for i in {1..5}; do echo hello $i; sleep 1; done")
-            result_container["completed"] = True
-            print("\n4. SEND_MESSAGE RETURNED SUCCESSFULLY")
-        except Exception as e:
-            result_container["error"] = str(e)
-            print(f"\n4. ERROR: {e}")
-
-    thread = threading.Thread(target=send_with_timeout, daemon=True)
-    thread.start()
-    thread.join(timeout=15)  # 5s for command + 10s buffer
-
-    if not result_container["completed"]:
-        print("\n4. TIMEOUT - send_message did not return within 15 seconds")
-
-    # Summary
-    print("\n" + "=" * 80)
-    print("SUMMARY:")
-    print("=" * 80)
-    print(f"Tools called: {len(tools_called)}")
-    print(f"Tool updates received: {len(tool_updates_received)}")
-    print(f"Chunks received: {len(chunks_received)}")
-    if tool_start_time and tool_end_time:
-        print(f"Time until first chunk: {tool_end_time - tool_start_time:.1f}s")
-        print(f"Expected: ~5s (command duration)")
-
-    full_message = "".join(chunks_received)
-    print(f"\nFull response ({len(full_message)} chars):")
-    print(full_message)
-
-    # Cleanup
-    client.close()
+            future.result(timeout=15)  # 5s for command + 10s buffer
+            printer.append("\n4. SEND_MESSAGE RETURNED SUCCESSFULLY")
+        except concurrent.futures.TimeoutError:
+            cancel_and_wait(session, future)
+            pytest.fail("send_message did not return within 15 seconds")
+        finally:
+            printer.flush()
+
+        # Summary
+        full_message = message_buffer.getvalue()
+        summary = [
+            "",
+            "=" * 80,
+            "SUMMARY:",
+            "=" * 80,
+            f"Tools called: {len(tools_called)}",
+            f"Tool updates received: {len(tool_updates_received)}",
+            f"Chunks received: {chunk_count}",
+        ]
+        if tool_start_ns is not None and tool_end_ns is not None:
+            summary.append(
+                f"Time until first chunk: {(tool_end_ns - tool_start_ns) / 1e9:.1f}s"
+            )
+            summary.append("Expected: ~5s (command duration)")
+        summary += ["", f"Full response ({len(full_message)} chars):", full_message]
+        sys.stdout.write("\n".join(summary) + "\n")
+        sys.stdout.flush()
+    finally:
+        client.close()
 
     # Assertions
-    assert len(chunks_received) > 0, "Should have received chunks"
+    assert chunk_count > 0, "Should have received chunks"
     assert len(tools_called) > 0, "Should have called tools"
-    if tool_start_time and tool_end_time:
-        elapsed = tool_end_time - tool_start_time
+    if tool_start_ns is not None and tool_end_ns is not None:
+        elapsed_ns = tool_end_ns - tool_start_ns
         assert (
-            elapsed >= 4.5
-        ), f"First chunk should arrive after ~5s, got {elapsed:.1f}s"
+            elapsed_ns >= 4_500_000_000
+        ), f"First chunk should arrive after ~5s, got {elapsed_ns / 1e9:.1f}s"
         print(
             f"\n✅ VERIFIED: Kiro waits for command completion before sending response"
         )
 
 
 if __name__ == "__main__":
-    test_long_running_command()
+    logging.basicConfig(
+        level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s"
+    )
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        test_long_running_command(executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
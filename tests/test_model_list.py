@@ -2,6 +2,7 @@
 """Test model list functionality"""
 
 import sys
+import time
 
 from kiro_session_acp import KiroSessionACP
 
@@ -13,8 +14,6 @@ def test_model_list():
     session.start_session()
 
     # Wait for session to start
-    import time
-
     time.sleep(3)
 
     models = session.get_available_models()
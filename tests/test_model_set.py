@@ -1,106 +1,86 @@
 #!/usr/bin/env python3.12
 """Test model set functionality via Telegram bot command"""
 
-import asyncio
-import sys
 import threading
-import time
+
+import pytest
 
 from kiro_session_acp import KiroSessionACP
+from tests._helpers import start_loop_thread, stop_loop_thread
 
 
-def test_model_set():
+def test_model_set(bg_loop):
     print("Testing model set functionality...")
 
     session = KiroSessionACP()
 
     # Track messages sent to telegram
     messages_sent = []
+    message_sent = threading.Event()
 
-    # Create event loop in separate thread for async callback
-    loop = asyncio.new_event_loop()
-
-    def run_loop():
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-
-    loop_thread = threading.Thread(target=run_loop, daemon=True)
-    loop_thread.start()
-
+    # Runs on bg_loop, scheduled by the worker like the bot's real callback
     async def mock_send_to_telegram(chat_id, text):
         print(f"[TELEGRAM] {text}")
         messages_sent.append(text)
+        message_sent.set()
 
     session.send_to_telegram = mock_send_to_telegram
-    session.send_to_telegram.loop = loop
+    session.send_to_telegram.loop = bg_loop
 
-    session.start_session()
+    try:
+        session.start_session()
 
-    # Wait for session to start
-    time.sleep(3)
+        # Wait for session to start
+        session.session_ready.wait(timeout=10)
 
-    # Get available models first
-    models = session.get_available_models()
-    if not models or not models.get("availableModels"):
-        print("\n✗ TEST FAILED: No models available")
-        loop.call_soon_threadsafe(loop.stop)
-        sys.exit(1)
+        # Get available models first
+        models = session.get_available_models()
+        if not models or not models.get("availableModels"):
+            pytest.fail("No models available")
 
-    current_model = models.get("currentModelId")
-    available_models = models.get("availableModels", [])
+        current_model = models.get("currentModelId")
+        available_models = models.get("availableModels", [])
 
-    print(f"\nCurrent model: {current_model}")
-    print(f"Available models: {[m['modelId'] for m in available_models]}")
+        print(f"\nCurrent model: {current_model}")
+        print(f"Available models: {[m['modelId'] for m in available_models]}")
 
-    # Find a different model to switch to
-    target_model = None
-    for model in available_models:
-        if model["modelId"] != current_model:
-            target_model = model["modelId"]
-            break
+        # Find a different model to switch to
+        target_model = None
+        for model in available_models:
+            if model["modelId"] != current_model:
+                target_model = model["modelId"]
+                break
 
-    if not target_model:
-        print("\n✗ TEST FAILED: Need at least 2 models to test switching")
-        loop.call_soon_threadsafe(loop.stop)
-        sys.exit(1)
+        if not target_model:
+            pytest.fail("Need at least 2 models to test switching")
 
-    print(f"\nSwitching to model: {target_model}")
+        print(f"\nSwitching to model: {target_model}")
 
-    # Test the set_model functionality via the queue-based API
-    try:
+        # Test the set_model functionality via the queue-based API
         chat_id = 12345
+        message_sent.clear()
         session.set_model(target_model, chat_id)
 
-        # Wait for worker thread to process
-        time.sleep(2)
+        # Wait for worker thread to report back
+        message_sent.wait(timeout=5)
 
         # Check that success message was sent
         if not messages_sent:
-            print("\n✗ TEST FAILED: No messages sent to Telegram")
-            loop.call_soon_threadsafe(loop.stop)
-            sys.exit(1)
+            pytest.fail("No messages sent to Telegram")
 
         success_msg = messages_sent[-1]
-        if "✓" in success_msg and target_model in success_msg:
-            print(f"\n✓ Success message sent: {success_msg}")
-            print("\n✓ TEST PASSED")
-        else:
-            print(f"\n✗ TEST FAILED: Unexpected message: {success_msg}")
-            loop.call_soon_threadsafe(loop.stop)
-            sys.exit(1)
-
-    except Exception as e:
-        print(f"\n✗ TEST FAILED: {e}")
-        import traceback
-
-        traceback.print_exc()
-        loop.call_soon_threadsafe(loop.stop)
-        sys.exit(1)
+        if "✓" not in success_msg or target_model not in success_msg:
+            pytest.fail(f"Unexpected message: {success_msg}")
+
+        print(f"\n✓ Success message sent: {success_msg}")
+        print("\n✓ TEST PASSED")
     finally:
         session.close()
-        loop.call_soon_threadsafe(loop.stop)
-        time.sleep(0.5)
 
 
 if __name__ == "__main__":
-    test_model_set()
+    loop, loop_thread = start_loop_thread()
+    try:
+        test_model_set(loop)
+    finally:
+        stop_loop_thread(loop, loop_thread)
@@ -1,8 +1,11 @@
 """Test that modes info is available and updated."""
 
-import time
+import pytest
 
 from kiro_session_acp import KiroSessionACP
+from tests._helpers import wait_for
+
+pytestmark = pytest.mark.xdist_group("serial")
 
 
 def test_modes_info():
@@ -16,7 +19,7 @@ def test_modes_info():
         # Start with default agent
         print("\n1. Starting default agent...")
         session.start_session("kiro_default")
-        time.sleep(2)
+        assert wait_for(lambda: session.get_available_modes() is not None)
 
         # Check modes info is available
         modes_info = session.get_available_modes()
@@ -37,14 +40,13 @@ def test_modes_info():
         print("\n2. Switching to facebook agent...")
         result = session.restart_with_agent("facebook")
         assert result is True
-        time.sleep(2)
+        assert wait_for(lambda: session.get_available_modes() is not None)
 
         # Check modes info for new agent
         modes_info = session.get_available_modes()
         assert modes_info is not None
 
         # After switching, mode should be updated to facebook
-        time.sleep(1)  # Give it a moment to process
         current_mode = modes_info.get("currentModeId")
         print(f"  Current mode after swap: {current_mode}")
 
@@ -3,69 +3,41 @@
 Test the exact flow of asking for pwd and handling permission requests.
 """
 
-import json
+import concurrent.futures
 import logging
-import sys
-import time
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-# Enable debug logging
-logging.basicConfig(
-    level=logging.DEBUG, format="%(name)s - %(levelname)s - %(message)s"
-)
+LOG_FORMAT = "%(name)s - %(levelname)s - %(message)s"
 
 print("Starting test...", flush=True)
 
-from acp_client import ACPClient
-from acp_session import ACPSession
+from tests._helpers import Recorder, cancel_and_wait, standalone_session
 
 print("Imports successful", flush=True)
 
 
-def test_pwd_flow():
+def test_pwd_flow(acp_session, bg_executor):
     print("=" * 80)
     print("TEST: Ask Kiro 'what is the pwd'")
     print("=" * 80)
 
-    # Start client
-    client = ACPClient("/home/mark/git/remote-kiro")
-    client.start()
-
-    # Initialize
-    print("\n1. INITIALIZING...")
-    result = client.initialize()
-    print(f"   Initialized: {result['agentInfo']}")
-
-    # Create session
-    print("\n2. CREATING SESSION...")
-    session_id = client.create_session("/home/mark/git/remote-kiro")
-    print(f"   Session ID: {session_id}")
-
-    # Create session wrapper
-    session = ACPSession(session_id, client)
+    session = acp_session
+    print(f"\n1. SESSION ID: {session.session_id}")
 
     # Track what we receive
-    messages_received = []
-    chunks_received = []
-    tools_called = []
+    recorder = Recorder(indent="   ")
     permission_requests = []
 
-    def on_chunk(content):
-        print(f"   📝 CHUNK: {repr(content[:50])}")
-        chunks_received.append(content)
-
-    def on_tool_call(tool):
-        tool_name = tool.get("title", "unknown")
-        print(f"   🔧 TOOL CALL: {tool_name}")
-        tools_called.append(tool)
-
     def on_turn_end():
-        print(f"   ✅ TURN END - {len(chunks_received)} chunks received")
-        full_message = "".join(chunks_received)
+        print(f"   ✅ TURN END - {recorder.chunk_count} chunks received")
+        full_message = recorder.text
         print(f"   📨 FULL MESSAGE: {full_message}")
 
     # Register callbacks
-    session.on_chunk(on_chunk)
-    session.on_tool_call(on_tool_call)
+    session.on_chunk(recorder.on_chunk)
+    session.on_tool_call(recorder.on_tool_call)
     session.on_turn_end(on_turn_end)
 
     # Intercept permission requests
@@ -88,55 +60,60 @@ def test_pwd_flow():
     session._handle_notification = intercept_notification
 
     # Send prompt
-    print("\n3. SENDING PROMPT: 'what is the pwd'")
+    print("\n2. SENDING PROMPT: 'what is the pwd'")
     print("   Waiting for response (10 second timeout)...")
 
-    import threading
-
-    result_container = {"completed": False, "error": None}
-
-    def send_with_timeout():
-        try:
-            session.send_message("what is the pwd")
-            result_container["completed"] = True
-            print("\n4. SEND_MESSAGE RETURNED SUCCESSFULLY")
-        except Exception as e:
-            result_container["error"] = str(e)
-            print(f"\n4. ERROR: {e}")
-
-    thread = threading.Thread(target=send_with_timeout, daemon=True)
-    thread.start()
-    thread.join(timeout=10)
-
-    if not result_container["completed"] and not result_container["error"]:
-        print("\n4. TIMEOUT - send_message did not return within 10 seconds")
+    future = bg_executor.submit(session.send_message, "what is the pwd")
+    try:
+        future.result(timeout=10)
+        print("\n3. SEND_MESSAGE RETURNED SUCCESSFULLY")
+    except concurrent.futures.TimeoutError:
+        print("\n3. TIMEOUT - send_message did not return within 10 seconds")
         print("   This means the permission request is blocking")
+        if not cancel_and_wait(session, future):
+            print("   ⚠️  Prompt still running after cancel")
+    except Exception as e:
+        print(f"\n3. ERROR: {e}")
 
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY:")
     print("=" * 80)
-    print(f"Tools called: {len(tools_called)}")
-    for tool in tools_called:
+    print(f"Tools called: {len(recorder.tools)}")
+    for tool in recorder.tools:
         print(f"  - {tool.get('title')}")
     print(f"Permission requests: {len(permission_requests)}")
     for req in permission_requests:
         print(f"  - Request ID: {req.get('id')}")
         print(f"    Tool: {req.get('params', {}).get('toolCall', {}).get('title')}")
-    print(f"Chunks received: {len(chunks_received)}")
-    print(f"Full message: {''.join(chunks_received)}")
-
-    # Cleanup
-    client.close()
+    print(f"Chunks received: {recorder.chunk_count}")
+    print(f"Full message: {recorder.text}")
 
     # Assert for pytest
-    assert len(chunks_received) > 0, "Should have received chunks"
-    assert len(tools_called) > 0, "Should have called tools"
+    assert recorder.chunk_count > 0, "Should have received chunks"
+    assert len(recorder.tools) > 0, "Should have called tools"
 
 
 if __name__ == "__main__":
-    success = test_pwd_flow()
-    # Don't return, just exit with code
-    import sys
-
-    sys.exit(0 if success else 1)
+    # Debug logging covers every streamed chunk; opt in with KIRO_TEST_DEBUG=1
+    log_listener = None
+    if os.environ.get("KIRO_TEST_DEBUG"):
+        # Only enqueue records on the calling thread; a listener thread
+        # does the formatting and stderr writes
+        log_queue = queue.SimpleQueue()
+        stderr_handler = logging.StreamHandler()
+        stderr_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_listener = QueueListener(log_queue, stderr_handler)
+        log_listener.start()
+        logging.basicConfig(level=logging.DEBUG, handlers=[QueueHandler(log_queue)])
+    else:
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        with standalone_session() as session:
+            test_pwd_flow(session, executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if log_listener is not None:
+            log_listener.stop()
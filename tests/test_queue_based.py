@@ -3,6 +3,7 @@
 
 import asyncio
 import logging
+from collections import deque
 
 import pytest
 
@@ -18,11 +19,14 @@ async def test_queue_based():
     print("TESTING QUEUE-BASED IMPLEMENTATION")
     print("=" * 60)
 
-    messages_received = []
+    # Only the most recent messages are kept for the results printout
+    messages_received = deque(maxlen=64)
+    message_event = asyncio.Event()
 
     # Create async callback for sending to Telegram
     async def send_to_telegram(chat_id, text):
         messages_received.append(text)
+        message_event.set()
         print(f"\n📱 TELEGRAM: {text[:100]}")
 
     # Store the event loop on the callback
@@ -38,8 +42,11 @@ async def test_queue_based():
     print("2. Starting session...")
     kiro.start_session()
 
-    # Wait for session to start
-    await asyncio.sleep(2)
+    # Wait for session to start (without blocking the event loop)
+    for _ in range(100):
+        if kiro.session_ready.is_set():
+            break
+        await asyncio.sleep(0.05)
 
     # Send message
     print("\n3. Sending message: 'what is 2+2?'")
@@ -47,10 +54,10 @@ async def test_queue_based():
 
     # Wait for response
     print("4. Waiting for response...")
-    for i in range(10):
-        await asyncio.sleep(1)
-        if messages_received:
-            break
+    try:
+        await asyncio.wait_for(message_event.wait(), timeout=10)
+    except asyncio.TimeoutError:
+        pass
 
     # Check results
     print(f"\n5. Results:")
@@ -15,6 +15,11 @@ def test_strip_ansi_removes_multiple_codes():
     assert strip_ansi(text) == "Bold green"
 
 
+def test_strip_ansi_removes_codes_mid_line():
+    text = "Progress:\x1b[2K 50%\x1b[0m done"
+    assert strip_ansi(text) == "Progress: 50% done"
+
+
 def test_strip_ansi_handles_plain_text():
     text = "Plain text"
     assert strip_ansi(text) == "Plain text"
@@ -3,85 +3,69 @@
 Test to see what ACP sends when a tool executes.
 """
 
+import concurrent.futures
 import logging
-import time
+import traceback
 
-from acp_client import ACPClient
-from acp_session import ACPSession
+import pytest
+
+from tests._helpers import Recorder, cancel_and_wait, standalone_session
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 
-def test_tool_output():
+# Leaves room for client startup and the cancel after a 20s send timeout
+@pytest.mark.timeout(45, method="signal")
+def test_tool_output(acp_session, bg_executor):
     print("=" * 80)
     print("TEST: What does ACP send when a tool executes?")
     print("=" * 80)
 
-    client = ACPClient("/home/mark/git/remote-kiro")
-    client.start()
-    client.initialize()
-
-    session_id = client.create_session("/home/mark/git/remote-kiro")
-    print(f"\nSession ID: {session_id}")
-
-    session = ACPSession(session_id, client)
+    session = acp_session
+    print(f"\nSession ID: {session.session_id}")
 
-    all_chunks = []
-    all_updates = []
-
-    def on_chunk(content):
-        print(f"📝 CHUNK: {repr(content)}")
-        all_chunks.append(content)
-
-    def on_tool_call(tool):
-        print(f"🔧 TOOL CALL: {tool}")
-        all_updates.append(("tool_call", tool))
+    recorder = Recorder()
 
     def on_turn_end():
         print(f"✅ TURN END")
-        full_message = "".join(all_chunks)
+        full_message = recorder.text
         print(f"\n{'=' * 80}")
         print(f"FULL MESSAGE ({len(full_message)} chars):")
         print(f"{'=' * 80}")
         print(full_message)
         print(f"{'=' * 80}")
 
-    session.on_chunk(on_chunk)
-    session.on_tool_call(on_tool_call)
+    session.on_chunk(recorder.on_chunk)
+    session.on_tool_call(recorder.on_tool_call)
     session.on_turn_end(on_turn_end)
 
     # Send a command that will execute a tool
     print("\n📤 Sending: 'for i in {1..5}; do echo hello $i; sleep 1; done'")
 
-    import threading
-
-    result = {"done": False}
-
-    def send():
-        try:
-            session.send_message("for i in {1..5}; do echo hello $i; sleep 1; done")
-            result["done"] = True
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            import traceback
-
-            traceback.print_exc()
-
-    thread = threading.Thread(target=send, daemon=True)
-    thread.start()
-    thread.join(timeout=30)
-
-    if not result["done"]:
+    future = bg_executor.submit(
+        session.send_message, "for i in {1..5}; do echo hello $i; sleep 1; done"
+    )
+    try:
+        future.result(timeout=20)
+    except concurrent.futures.TimeoutError:
         print("⏱️  Timeout waiting for response")
-
-    client.close()
+        if not cancel_and_wait(session, future):
+            print("⚠️  Prompt still running after cancel")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        traceback.print_exc()
 
     print(f"\n{'=' * 80}")
     print(f"SUMMARY:")
-    print(f"  Total chunks: {len(all_chunks)}")
-    print(f"  Total updates: {len(all_updates)}")
+    print(f"  Total chunks: {recorder.chunk_count}")
+    print(f"  Total tool calls: {len(recorder.tools)}")
     print(f"{'=' * 80}")
 
 
 if __name__ == "__main__":
-    test_tool_output()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        with standalone_session() as session:
+            test_tool_output(session, executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -3,65 +3,65 @@
 Test sending usage command to Kiro and checking response - with debug output.
 """
 
+import concurrent.futures
 import json
 import logging
 import sys
 
+import pytest
+
 logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
 
-from acp_client import ACPClient
-from acp_session import ACPSession
+from tests._helpers import Recorder, cancel_and_wait, standalone_session
+
+# What send_message("/usage") puts in the session/prompt request
+USAGE_PROMPT_JSON = json.dumps([{"type": "text", "text": "/usage"}], indent=2)
 
 
-def test_usage_flow():
+def test_usage_flow(acp_session, bg_executor):
     print("=" * 80)
     print("TEST: Send backslash usage to Kiro")
     print("=" * 80)
 
-    client = ACPClient("/home/mark/git/remote-kiro")
-    client.start()
-
-    print("\n1. INITIALIZING...")
-    result = client.initialize()
-    print("   Initialized:", result.get("agentInfo"))
-
-    print("\n2. CREATING SESSION...")
-    session_id = client.create_session("/home/mark/git/remote-kiro")
-    print("   Session ID:", session_id)
-
-    session = ACPSession(session_id, client)
+    session = acp_session
+    print("\n1. SESSION ID:", session.session_id)
 
-    chunks_received = []
+    recorder = Recorder()
+    session.on_chunk(recorder.on_chunk)
 
-    def on_chunk(content):
-        chunks_received.append(content)
-
-    session.on_chunk(on_chunk)
-
-    print("\n3. SENDING MESSAGE: /usage")
+    print("\n2. SENDING MESSAGE: /usage")
     print("   This will be sent as JSON-RPC session/prompt with:")
-    print(json.dumps([{"type": "text", "text": "/usage"}], indent=2))
-
-    session.send_message("/usage")
-
-    full_message = "".join(chunks_received)
-    print("\n4. FULL RESPONSE RECEIVED:")
+    print(USAGE_PROMPT_JSON)
+
+    # /usage is a short in-band command, so don't wait long for it
+    future = bg_executor.submit(session.send_message, "/usage")
+    try:
+        future.result(timeout=15)
+    except concurrent.futures.TimeoutError:
+        cancel_and_wait(session, future)
+        pytest.fail("/usage timed out")
+
+    full_message = recorder.text
+    print("\n3. FULL RESPONSE RECEIVED:")
     print("-" * 80)
     print(full_message)
     print("-" * 80)
 
-    print("\n5. CHECKING RESPONSE CONTENT:")
+    print("\n4. CHECKING RESPONSE CONTENT:")
     print(f"   Contains 'credit': {'credit' in full_message.lower()}")
     print(f"   Contains 'billing': {'billing' in full_message.lower()}")
     print(f"   Contains 'usage': {'usage' in full_message.lower()}")
     print(f"   Contains 'make': {'make' in full_message.lower()}")
     print(f"   Contains 'telegram': {'telegram' in full_message.lower()}")
 
-    client.close()
-
     print("\nTEST COMPLETE")
 
 
 if __name__ == "__main__":
-    test_usage_flow()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        with standalone_session() as session:
+            test_usage_flow(session, executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     sys.exit(0)
@@ -7,51 +7,32 @@ It works in regular CLI mode but returns "I don't have a /usage command availabl
 when sent via ACP session/prompt.
 """
 
-import logging
 import sys
 
-logging.basicConfig(
-    level=logging.DEBUG, format="%(name)s - %(levelname)s - %(message)s"
-)
+import pytest
 
-from acp_client import ACPClient
-from acp_session import ACPSession
+from tests._helpers import Recorder
 
 
-def test_usage_flow_DISABLED():
+@pytest.mark.skip(reason="/usage not supported in ACP mode")
+def test_usage_flow(acp_session):
     print("=" * 80)
     print("TEST: Send backslash usage to Kiro")
     print("=" * 80)
 
-    client = ACPClient("/home/mark/git/remote-kiro")
-    client.start()
+    session = acp_session
+    print("\n1. SESSION ID:", session.session_id)
 
-    print("\n1. INITIALIZING...")
-    result = client.initialize()
-    print("   Initialized:", result.get("agentInfo"))
+    recorder = Recorder()
+    session.on_chunk(recorder.on_chunk)
 
-    print("\n2. CREATING SESSION...")
-    session_id = client.create_session("/home/mark/git/remote-kiro")
-    print("   Session ID:", session_id)
-
-    session = ACPSession(session_id, client)
-
-    chunks_received = []
-
-    def on_chunk(content):
-        chunks_received.append(content)
-
-    session.on_chunk(on_chunk)
-
-    print("\n3. SENDING: /usage")
+    print("\n2. SENDING: /usage")
     session.send_message("/usage")
 
-    full_message = "".join(chunks_received)
-    print("\n4. RESPONSE:\n" + full_message)
-
-    client.close()
+    full_message = recorder.text
+    print("\n3. RESPONSE:\n" + full_message)
 
-    assert len(chunks_received) > 0, "Should have received response"
+    assert recorder.chunk_count > 0, "Should have received response"
     assert (
         "credit" in full_message.lower()
         or "billing" in full_message.lower()
@@ -2,11 +2,15 @@
 
 import re
 
+_ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape codes from text."""
-    ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-    return ansi_escape.sub("", text)
+    # Most output has no escapes at all; a single ESC scan skips the regex
+    if "\x1b" not in text:
+        return text
+    return _ANSI_ESCAPE.sub("", text)
 
 
 def truncate_message(text: str, max_length: int = 4000) -> str: